@@ -6,87 +6,175 @@ Bedrock/Blockbench 动画导出器
 import bpy
 import json
 import math
-from decimal import Decimal
+import re
+import numpy as np
+from functools import lru_cache
 from typing import Dict, List, Any, Optional
 from bpy.props import StringProperty
 from bpy_extras.io_utils import ExportHelper
-from mathutils import Quaternion
+from mathutils import Euler, Quaternion
+
+try:
+    # 可选依赖：orjson 的 C 级序列化比标准库快数倍
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # 可选依赖：numba 可将转换内核 JIT 编译为融合的 SIMD 循环
+    from numba import njit
+except ImportError:
+    njit = None
 
 
 # 动画时间戳精度（小数位数）
 ANIMATION_TIMESTAMP_PRECISION = 4
 # Minecraft 缩放因子：Blender 1米 = Minecraft 16单位
 MINECRAFT_SCALE_FACTOR = 16.0
-
-
+# 弧度 -> 度数 常量（避免逐元素调用 math.degrees）
+_RAD2DEG = 180.0 / math.pi
+
+# 解析 fcurve 数据路径，例如: pose.bones["bone_name"].location
+# 支持两种引号格式
+_BONE_DATA_PATH_RE = re.compile(
+    r'pose\.bones\[["\'](?P<name>[^"\']+)["\']\]'
+    r'\.(?P<attr>location|rotation_quaternion|rotation_euler'
+    r'|rotation_axis_angle|scale)'
+)
+
+# KeyframePoint.interpolation 的枚举整数值 -> Blockbench 插值类型
+# （foreach_get 返回整数枚举而不是字符串；索引阶段直接映射成
+# Blockbench 的 step/linear/bezier，其余缓动类型按 linear 处理）
+_INTERP_ENUM_TO_BB = {
+    0: 'step',    # CONSTANT
+    1: 'linear',  # LINEAR
+    2: 'bezier',  # BEZIER
+}
+
+# fcurve 属性名 -> 变换类型
+_ATTR_TO_TRANSFORM_TYPE = {
+    'location': 'location',
+    'rotation_quaternion': 'rotation',
+    'rotation_euler': 'rotation',
+    'rotation_axis_angle': 'rotation',
+    'scale': 'scale',
+}
+
+
+@lru_cache(maxsize=None)
 def frame_to_timestamp(frame: int, fps: float) -> str:
-    """将帧数转换为秒数时间戳字符串（帧1对应时间0）"""
-    timestamp = Decimal((frame - 1) / fps)
-    result = round(timestamp, ANIMATION_TIMESTAMP_PRECISION)
-    # 使用 normalize() 移除尾随零，但确保整数时返回 "0" 而不是科学计数法
-    normalized = result.normalize()
-    return str(normalized)
-
-
-def get_vector_json(vec) -> List[float]:
-    """将向量转换为 JSON 格式的列表，四舍五入到合理精度"""
-    return [round(v, 6) for v in vec]
+    """将帧数转换为秒数时间戳字符串（帧1对应时间0）
 
-
-def blender_interpolation_to_blockbench(interpolation: str) -> str:
-    """
-    将 Blender 插值类型转换为 Blockbench 支持的类型
-
-    Blender 类型: CONSTANT, LINEAR, BEZIER
-    Blockbench 支持: linear, smooth, bezier, step
+    相同帧号会在不同骨骼/变换通道间反复出现，因此结果按 (frame, fps) 缓存。
     """
-    mapping = {
-        'CONSTANT': 'step',
-        'LINEAR': 'linear',
-        'BEZIER': 'bezier',
-    }
-    return mapping.get(interpolation, 'linear')
+    timestamp = (frame - 1) / fps
+    # 固定小数位格式化后移除尾随零（整数时返回 "0"）
+    result = f'{timestamp:.{ANIMATION_TIMESTAMP_PRECISION}f}'.rstrip('0').rstrip('.')
+    return result or '0'
 
 
-def convert_location_to_minecraft(loc) -> List[float]:
-    """
-    将 Blender 位置转换为 Minecraft 坐标系
-    Blender: X右, Y前, Z上
-    Minecraft: X右, Y上, Z前
-    """
-    return [
-        loc[0] * MINECRAFT_SCALE_FACTOR,  # X -> X
-        loc[2] * MINECRAFT_SCALE_FACTOR,  # Z -> Y (上)
-        loc[1] * MINECRAFT_SCALE_FACTOR,  # Y -> Z (前)
-    ]
+def dumps_json(data: Dict[str, Any]) -> str:
+    """将数据序列化为带缩进的 JSON 字符串（优先使用 orjson）"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(data, indent=2, ensure_ascii=False)
 
 
-def convert_rotation_to_minecraft(rot_euler) -> List[float]:
+def quat_to_euler_xzy_batch(quats: np.ndarray) -> np.ndarray:
     """
-    将 Blender 欧拉角（弧度，XZY顺序）转换为 Minecraft 旋转（度数）
+    批量将四元数转换为 XZY 顺序的欧拉角（弧度）
 
-    导入时的转换 (import_bedrock_anim.py):
-        Minecraft [X, Y, Z] -> convert_rotation_axis -> [X, Z, -Y]
-        然后用 Euler([X, Z, -Y], "XZY") 创建
+    等价于对每行调用 mathutils.Quaternion(...).to_euler('XZY')，
+    但整批用 NumPy 闭式公式一次算完，避免逐骨骼跨越 Python/C 边界。
 
-        所以 Blender euler 内部:
-        euler.x = MC_X
-        euler.y = MC_Z  (导入时 rotation[2] 放到位置1)
-        euler.z = -MC_Y (导入时 -rotation[1] 放到位置2)
-
-    导出是逆操作:
-        MC_X = euler.x
-        MC_Y = -euler.z (因为 euler.z = -MC_Y)
-        MC_Z = euler.y
+    :param quats: (n, 4) 数组，每行为 (w, x, y, z)
+    :returns: (n, 3) 数组，每行为 (x, y, z) 欧拉角
     """
-    # 将弧度转换为度数
-    degrees = [math.degrees(r) for r in rot_euler]
-    # 还原 Minecraft 格式 [X, Y, Z]
-    return [
-        degrees[0],   # euler.x -> Minecraft X
-        -degrees[2],  # -euler.z -> Minecraft Y
-        degrees[1],   # euler.y -> Minecraft Z
-    ]
+    # 归一化（mathutils 的 to_euler 也会先归一化）
+    q = quats / np.linalg.norm(quats, axis=1, keepdims=True)
+    w, x, y, z = q[:, 0], q[:, 1], q[:, 2], q[:, 3]
+
+    # XZY 顺序（先 X 后 Z 再 Y）的旋转矩阵提取公式
+    ez = np.arcsin(np.clip(2.0 * (w * z + x * y), -1.0, 1.0))
+    ex = np.arctan2(2.0 * (w * x - y * z), 1.0 - 2.0 * (x * x + z * z))
+    ey = np.arctan2(2.0 * (w * y - x * z), 1.0 - 2.0 * (y * y + z * z))
+
+    return np.stack([ex, ey, ez], axis=1)
+
+
+def _convert_transforms_batch_numpy(
+    locations: np.ndarray, quaternions: np.ndarray, scales: np.ndarray
+):
+    """纯 NumPy 版本的批量 Blender -> Minecraft 变换转换"""
+    eulers = quat_to_euler_xzy_batch(quaternions)
+
+    # 位置: Blender (X右, Y前, Z上) -> Minecraft (X右, Y上, Z前)，含缩放
+    mc_positions = locations[:, (0, 2, 1)] * MINECRAFT_SCALE_FACTOR
+    # 旋转: 导入时 Minecraft [X, Y, Z] 被映射为 euler (X, Z, -Y)，
+    # 导出是逆操作: MC_X = euler.x, MC_Y = -euler.z, MC_Z = euler.y
+    # 度数转换用常量乘法就地完成，省一次 np.degrees 的中间数组
+    mc_rotations = np.stack(
+        [eulers[:, 0], -eulers[:, 2], eulers[:, 1]], axis=1
+    )
+    mc_rotations *= _RAD2DEG
+    # 缩放: 不需要缩放因子，只需重排轴
+    mc_scales = scales[:, (0, 2, 1)]
+
+    return mc_positions, mc_rotations, mc_scales
+
+
+if njit is not None:
+
+    @njit(cache=True, fastmath=True)
+    def _convert_transforms_kernel(
+        locations, quaternions, scales, out_pos, out_rot, out_scale
+    ):  # pragma: no cover - 需要 numba
+        rad2deg = _RAD2DEG
+        for i in range(locations.shape[0]):
+            out_pos[i, 0] = locations[i, 0] * 16.0
+            out_pos[i, 1] = locations[i, 2] * 16.0
+            out_pos[i, 2] = locations[i, 1] * 16.0
+
+            w = quaternions[i, 0]
+            x = quaternions[i, 1]
+            y = quaternions[i, 2]
+            z = quaternions[i, 3]
+            norm = math.sqrt(w * w + x * x + y * y + z * z)
+            w /= norm
+            x /= norm
+            y /= norm
+            z /= norm
+            sin_z = 2.0 * (w * z + x * y)
+            if sin_z > 1.0:
+                sin_z = 1.0
+            elif sin_z < -1.0:
+                sin_z = -1.0
+            ez = math.asin(sin_z)
+            ex = math.atan2(2.0 * (w * x - y * z), 1.0 - 2.0 * (x * x + z * z))
+            ey = math.atan2(2.0 * (w * y - x * z), 1.0 - 2.0 * (y * y + z * z))
+            out_rot[i, 0] = ex * rad2deg
+            out_rot[i, 1] = -ez * rad2deg
+            out_rot[i, 2] = ey * rad2deg
+
+            out_scale[i, 0] = scales[i, 0]
+            out_scale[i, 1] = scales[i, 2]
+            out_scale[i, 2] = scales[i, 1]
+
+    def convert_transforms_batch(
+        locations: np.ndarray, quaternions: np.ndarray, scales: np.ndarray
+    ):
+        """批量 Blender -> Minecraft 变换转换（numba 融合内核）"""
+        n = locations.shape[0]
+        out_pos = np.empty((n, 3), dtype=np.float64)
+        out_rot = np.empty((n, 3), dtype=np.float64)
+        out_scale = np.empty((n, 3), dtype=np.float64)
+        _convert_transforms_kernel(
+            locations, quaternions, scales, out_pos, out_rot, out_scale
+        )
+        return out_pos, out_rot, out_scale
+
+else:
+    convert_transforms_batch = _convert_transforms_batch_numpy
 
 
 class BBAnimExporter:
@@ -94,90 +182,225 @@ class BBAnimExporter:
 
     def __init__(self, armature):
         self.armature = armature
-        self.fps = bpy.context.scene.render.fps / bpy.context.scene.render.fps_base
+        # 缓存场景引用，避免反复解析 bpy.context 的 RNA 包装
+        self._scene = bpy.context.scene
+        self.fps = self._scene.render.fps / self._scene.render.fps_base
+        # 单遍扫描 action 的 fcurve，建立 骨骼 -> 关键帧 / 通道 索引
+        self._fcurve_index, self._channel_fcurves = \
+            self._index_fcurves(self._get_action())
+
+    def _get_action(self):
+        """获取骨架当前的 Action（可能为 None）"""
+        if not self.armature.animation_data:
+            return None
+        return self.armature.animation_data.action
 
-    def get_bone_keyframes(self, bone_name: str) -> Dict[str, Dict[int, str]]:
+    def set_action(self, action) -> None:
+        """切换要导出的 Action，只重建该 Action 的 fcurve 索引
+
+        批量导出时复用同一个导出器实例，切换 Action 的开销
+        仅为一次单遍 fcurve 扫描。
         """
-        获取指定骨骼的所有关键帧帧号和插值类型，按变换类型分类
+        # 重复赋值相同的 Action 也会触发一次依赖图更新，跳过
+        if self.armature.animation_data.action is not action:
+            self.armature.animation_data.action = action
+        self._fcurve_index, self._channel_fcurves = self._index_fcurves(action)
 
-        返回格式: {transform_type: {frame: interpolation_type}}
+    @staticmethod
+    def _index_fcurves(action):
         """
-        keyframes = {
-            'location': {},
-            'rotation': {},
-            'scale': {}
-        }
+        单遍扫描 action 的所有 fcurve，按骨骼分类关键帧和通道
 
-        if not self.armature.animation_data or not self.armature.animation_data.action:
-            return keyframes
+        返回两个索引:
+        - {bone_name: {transform_type: {frame: blockbench_interp}}}
+        - {bone_name: {attr: {array_index: fcurve}}}，供直接求值使用
+        """
+        index: Dict[str, Dict[str, Dict[int, str]]] = {}
+        channels: Dict[str, Dict[str, Dict[int, Any]]] = {}
 
-        action = self.armature.animation_data.action
+        if action is None:
+            return index, channels
 
         for fcurve in action.fcurves:
-            # 解析数据路径，例如: pose.bones["bone_name"].location
-            # 支持两种引号格式
-            if f'pose.bones["{bone_name}"]' not in fcurve.data_path and \
-               f"pose.bones['{bone_name}']" not in fcurve.data_path:
+            match = _BONE_DATA_PATH_RE.match(fcurve.data_path)
+            if match is None:
+                continue
+
+            bone_name = match.group('name')
+            attr = match.group('attr')
+            transform_type = _ATTR_TO_TRANSFORM_TYPE[attr]
+
+            bone_channels = channels.setdefault(bone_name, {})
+            bone_channels.setdefault(attr, {})[fcurve.array_index] = fcurve
+
+            bone_keyframes = index.setdefault(bone_name, {
+                'location': {},
+                'rotation': {},
+                'scale': {}
+            })
+            transform_keyframes = bone_keyframes[transform_type]
+
+            # foreach_get 一次性批量读取帧号和插值枚举，
+            # 避免每个关键帧两次跨越 RNA 边界
+            points = fcurve.keyframe_points
+            count = len(points)
+            if count == 0:
                 continue
+            co = np.empty(2 * count, dtype=np.float64)
+            points.foreach_get('co', co)
+            interpolations = np.empty(count, dtype=np.int32)
+            points.foreach_get('interpolation', interpolations)
+
+            frames = co[0::2].astype(np.int64).tolist()
+            for frame, interp_code in zip(frames, interpolations.tolist()):
+                # 如果同一帧已有记录，保留已有的（多个通道可能有不同插值）
+                if frame not in transform_keyframes:
+                    transform_keyframes[frame] = _INTERP_ENUM_TO_BB.get(
+                        interp_code, 'linear'
+                    )
+
+        return index, channels
 
-            # 确定变换类型
-            transform_type = None
-            if '.location' in fcurve.data_path:
-                transform_type = 'location'
-            elif '.rotation_quaternion' in fcurve.data_path:
-                transform_type = 'rotation'
-            elif '.rotation_euler' in fcurve.data_path:
-                transform_type = 'rotation'
-            elif '.rotation_axis_angle' in fcurve.data_path:
-                transform_type = 'rotation'
-            elif '.scale' in fcurve.data_path:
-                transform_type = 'scale'
-
-            if transform_type:
-                for keyframe in fcurve.keyframe_points:
-                    frame = int(keyframe.co[0])
-                    interpolation = keyframe.interpolation
-                    # 如果同一帧已有记录，保留已有的（多个通道可能有不同插值）
-                    if frame not in keyframes[transform_type]:
-                        keyframes[transform_type][frame] = interpolation
+    def get_bone_keyframes(self, bone_name: str) -> Dict[str, Dict[int, str]]:
+        """
+        获取指定骨骼的所有关键帧帧号和插值类型，按变换类型分类
 
+        返回格式: {transform_type: {frame: interpolation_type}}
+        """
+        keyframes = self._fcurve_index.get(bone_name)
+        if keyframes is None:
+            return {
+                'location': {},
+                'rotation': {},
+                'scale': {}
+            }
         return keyframes
 
-    def sample_bone_transform_at_frame(self, bone_name: str, frame: int) -> Optional[Dict]:
-        """在指定帧采样骨骼的变换数据"""
-        if bone_name not in self.armature.pose.bones:
-            return None
+    @staticmethod
+    def _rotation_setup(pose_bone, channels):
+        """按骨骼的旋转模式选择默认值、旋转通道和换算函数（每骨骼一次）
 
-        pose_bone = self.armature.pose.bones[bone_name]
+        返回 (rotation_channels, defaults, convert)；convert 为 None
+        表示通道值本身就是四元数。旋转模式在此判定一次，
+        每帧求值时不再做字符串比较。
+        """
+        mode = pose_bone.rotation_mode
+        if mode == 'QUATERNION':
+            return channels.get('rotation_quaternion', {}), \
+                list(pose_bone.rotation_quaternion), None
+        if mode == 'AXIS_ANGLE':
+            # axis_angle 格式: (angle, x, y, z)
+            def convert_axis_angle(values):
+                return list(
+                    Quaternion((values[1], values[2], values[3]), values[0])
+                )
+            return channels.get('rotation_axis_angle', {}), \
+                list(pose_bone.rotation_axis_angle), convert_axis_angle
+
+        # 其他欧拉模式：按骨骼自身的旋转顺序转成四元数
+        def convert_euler(values):
+            return list(Euler(values, mode).to_quaternion())
+        return channels.get('rotation_euler', {}), \
+            list(pose_bone.rotation_euler), convert_euler
+
+    @staticmethod
+    def _evaluate_bone_quaternion(
+        defaults: List[float], rotation_channels, convert, frame
+    ) -> List[float]:
+        """在指定帧求值骨骼旋转，统一返回四元数 (w, x, y, z) 列表
+
+        缺失的通道使用骨骼当前的属性值（defaults）。
+        """
+        values = defaults.copy()
+        for array_index, fcurve in rotation_channels.items():
+            values[array_index] = fcurve.evaluate(frame)
+        if convert is None:
+            return values
+        return convert(values)
+
+    def collect_samples(
+        self,
+        bones_keyframes: Dict[str, Dict[str, Dict[int, str]]],
+    ) -> Dict[str, Dict[int, Dict]]:
+        """
+        通过 fcurve.evaluate 直接采样所有骨骼的变换数据
 
-        # 设置当前帧
-        bpy.context.scene.frame_set(frame)
-        bpy.context.view_layer.update()
+        fcurve 求值不需要滚动时间线，因此完全不触发依赖图求值
+        （frame_set 会重新求值整个场景的修改器/约束/驱动）。
+        缺失的通道使用骨骼当前的属性值。
+        传入的关键帧应已过滤到导出范围内。
 
-        # 获取局部变换
-        location = pose_bone.location.copy()
+        返回格式: {bone_name: {frame: transform}}
+        """
+        pose_bones = self.armature.pose.bones
 
-        # 获取旋转（转换为欧拉角，使用 XZY 顺序以匹配 mcblend/Minecraft）
-        if pose_bone.rotation_mode == 'QUATERNION':
-            rotation = pose_bone.rotation_quaternion.to_euler('XZY')
-        elif pose_bone.rotation_mode == 'AXIS_ANGLE':
-            # axis_angle 格式: (angle, x, y, z)
-            aa = pose_bone.rotation_axis_angle
-            axis = (aa[1], aa[2], aa[3])
-            angle = aa[0]
-            quat = Quaternion(axis, angle)
-            rotation = quat.to_euler('XZY')
-        else:
-            # 如果原本是其他欧拉模式，先转成四元数再转 XZY
-            rotation = pose_bone.rotation_euler.to_quaternion().to_euler('XZY')
+        # 收集所有 (骨骼, 帧) 采样点，再整批做坐标系转换
+        entries: List[tuple] = []
+        locations: List[List[float]] = []
+        quaternions: List[List[float]] = []
+        scales: List[List[float]] = []
 
-        scale = pose_bone.scale.copy()
+        for bone_name, keyframes in bones_keyframes.items():
+            pose_bone = pose_bones.get(bone_name)
+            if pose_bone is None:
+                continue
 
-        return {
-            'location': location,
-            'rotation': rotation,
-            'scale': scale
-        }
+            frames = set()
+            for transform_keyframes in keyframes.values():
+                frames.update(transform_keyframes)
+            if not frames:
+                continue
+
+            # 每骨骼只做一次的准备：通道、默认值、旋转模式
+            channels = self._channel_fcurves.get(bone_name, {})
+            location_channels = channels.get('location', {})
+            scale_channels = channels.get('scale', {})
+            default_location = list(pose_bone.location)
+            default_scale = list(pose_bone.scale)
+            rotation_channels, default_rotation, rotation_convert = \
+                self._rotation_setup(pose_bone, channels)
+
+            for frame in sorted(frames):
+                location = default_location.copy()
+                for array_index, fcurve in location_channels.items():
+                    location[array_index] = fcurve.evaluate(frame)
+
+                scale = default_scale.copy()
+                for array_index, fcurve in scale_channels.items():
+                    scale[array_index] = fcurve.evaluate(frame)
+
+                entries.append((bone_name, frame))
+                locations.append(location)
+                quaternions.append(self._evaluate_bone_quaternion(
+                    default_rotation, rotation_channels, rotation_convert, frame
+                ))
+                scales.append(scale)
+
+        samples: Dict[str, Dict[int, Dict]] = {}
+        if not entries:
+            return samples
+
+        # 整批转换到 Minecraft 坐标系（位置缩放、XZY 欧拉角、轴重排）
+        mc_positions, mc_rotations, mc_scales = convert_transforms_batch(
+            np.asarray(locations),
+            np.asarray(quaternions),
+            np.asarray(scales),
+        )
+
+        # 一次性整批四舍五入并转回 Python 列表，
+        # 取代组装阶段逐关键帧、逐分量的 round 调用
+        mc_positions = np.round(mc_positions, 6).tolist()
+        mc_rotations = np.round(mc_rotations, 6).tolist()
+        mc_scales = np.round(mc_scales, 6).tolist()
+
+        for index, (bone_name, frame) in enumerate(entries):
+            samples.setdefault(bone_name, {})[frame] = {
+                'position': mc_positions[index],
+                'rotation': mc_rotations[index],
+                'scale': mc_scales[index],
+            }
+
+        return samples
 
     def _make_keyframe_value(
         self,
@@ -197,149 +420,150 @@ class BBAnimExporter:
         注意：step 表示从当前帧到下一帧的插值方式。
         当前一帧是 step 时，当前帧需要用 pre/post 格式来表示跳变。
         """
-        bb_interp = blender_interpolation_to_blockbench(interpolation)
-        prev_bb_interp = blender_interpolation_to_blockbench(prev_interpolation) if prev_interpolation else None
-
+        # 插值类型在索引阶段就已映射为 Blockbench 的 step/linear/bezier
         # 如果前一帧是 step，当前帧需要 pre/post 格式
-        if prev_bb_interp == 'step' and prev_vector is not None:
+        if prev_vector is not None and prev_interpolation == 'step':
             return {
                 'pre': prev_vector,
                 'post': vector
             }
 
-        # linear 是默认值，直接返回向量
-        if bb_interp == 'linear':
-            return vector
-
         # bezier 使用 lerp_mode
-        if bb_interp == 'bezier':
+        if interpolation == 'bezier':
             return {
                 'vector': vector,
                 'lerp_mode': 'bezier'
             }
 
-        # 当前帧是 step 但前一帧不是 step，直接返回向量（step 影响的是到下一帧的插值）
+        # linear 是默认值；当前帧是 step 时也直接返回向量
+        # （step 影响的是到下一帧的插值）
         return vector
 
-    def export_bone_animation(self, bone_name: str, frame_start: int, frame_end: int) -> Dict[str, Any]:
-        """导出单个骨骼的动画数据"""
-        bone_data = {}
+    def _build_channel_data(
+        self,
+        channel_keyframes: Dict[int, str],
+        samples: Dict[int, Dict],
+        sample_key: str
+    ) -> Dict[str, Any]:
+        """组装单个变换通道的 时间戳 -> 关键帧值 字典
+
+        与前后关键帧值都相同的中间关键帧会被省略：Bedrock 格式在
+        linear/step 插值下允许省略内部相同关键帧，空闲骨骼的通道
+        往往能因此缩小大半，JSON 序列化量也随之减少。
+        """
+        # 先物化 (帧, 向量, 插值) 序列，便于向前看一帧
+        items = []
+        for frame in sorted(channel_keyframes):
+            transform = samples.get(frame)
+            if transform is None:
+                continue
+            # 向量已在采样阶段整批完成四舍五入
+            items.append((frame, transform[sample_key], channel_keyframes[frame]))
 
-        keyframes = self.get_bone_keyframes(bone_name)
-
-        # 收集位置关键帧
-        if keyframes['location']:
-            position_data = {}
-            prev_loc = None
-            prev_interp = None
-            for frame in sorted(keyframes['location'].keys()):
-                if frame < frame_start or frame > frame_end:
-                    continue
-                transform = self.sample_bone_transform_at_frame(bone_name, frame)
-                if transform:
-                    mc_loc = convert_location_to_minecraft(transform['location'])
-                    timestamp = frame_to_timestamp(frame, self.fps)
-                    interpolation = keyframes['location'][frame]
-                    current_loc = get_vector_json(mc_loc)
-                    position_data[timestamp] = self._make_keyframe_value(
-                        current_loc, interpolation, prev_loc, prev_interp
-                    )
-                    prev_loc = current_loc
-                    prev_interp = interpolation
-
-            if position_data:
-                bone_data['position'] = position_data
-
-        # 收集旋转关键帧
-        if keyframes['rotation']:
-            rotation_data = {}
-            prev_rot = None
-            prev_interp = None
-            for frame in sorted(keyframes['rotation'].keys()):
-                if frame < frame_start or frame > frame_end:
-                    continue
-                transform = self.sample_bone_transform_at_frame(bone_name, frame)
-                if transform:
-                    mc_rot = convert_rotation_to_minecraft(transform['rotation'])
-                    timestamp = frame_to_timestamp(frame, self.fps)
-                    interpolation = keyframes['rotation'][frame]
-                    current_rot = get_vector_json(mc_rot)
-                    rotation_data[timestamp] = self._make_keyframe_value(
-                        current_rot, interpolation, prev_rot, prev_interp
-                    )
-                    prev_rot = current_rot
-                    prev_interp = interpolation
-
-            if rotation_data:
-                bone_data['rotation'] = rotation_data
-
-        # 收集缩放关键帧
-        if keyframes['scale']:
-            scale_data = {}
-            prev_scale = None
-            prev_interp = None
-            for frame in sorted(keyframes['scale'].keys()):
-                if frame < frame_start or frame > frame_end:
-                    continue
-                transform = self.sample_bone_transform_at_frame(bone_name, frame)
-                if transform:
-                    # 缩放不需要坐标轴转换，但需要重排序
-                    mc_scale = [
-                        transform['scale'][0],  # X
-                        transform['scale'][2],  # Z -> Y
-                        transform['scale'][1],  # Y -> Z
-                    ]
-                    timestamp = frame_to_timestamp(frame, self.fps)
-                    interpolation = keyframes['scale'][frame]
-                    current_scale = get_vector_json(mc_scale)
-                    scale_data[timestamp] = self._make_keyframe_value(
-                        current_scale, interpolation, prev_scale, prev_interp
-                    )
-                    prev_scale = current_scale
-                    prev_interp = interpolation
+        fps = self.fps
+        last = len(items) - 1
+
+        # 纯 linear 通道（最常见）：关键帧值就是向量本身，
+        # 无 step/bezier 状态需要跟踪，直接用推导式构建字典
+        if last >= 0 and all(interp == 'linear' for _, _, interp in items):
+            return {
+                frame_to_timestamp(frame, fps): vector
+                for i, (frame, vector, _) in enumerate(items)
+                if not (0 < i < last
+                        and vector == items[i - 1][1]
+                        and vector == items[i + 1][1])
+            }
+
+        channel_data: Dict[str, Any] = {}
+        prev_vector = None
+        prev_interp = None
+        for i, (frame, vector, interpolation) in enumerate(items):
+            # bezier 的缓动会影响中间形状，只对 linear/step 去重
+            if (0 < i < last
+                    and vector == prev_vector
+                    and interpolation == prev_interp
+                    and items[i + 1][1] == vector
+                    and interpolation != 'bezier'):
+                continue
+            timestamp = frame_to_timestamp(frame, fps)
+            channel_data[timestamp] = self._make_keyframe_value(
+                vector, interpolation, prev_vector, prev_interp
+            )
+            prev_vector = vector
+            prev_interp = interpolation
 
-            if scale_data:
-                bone_data['scale'] = scale_data
+        return channel_data
+
+    def export_bone_animation(
+        self,
+        bone_name: str,
+        keyframes: Dict[str, Dict[int, str]],
+        samples: Dict[int, Dict]
+    ) -> Dict[str, Any]:
+        """根据已采样的变换数据组装单个骨骼的动画数据"""
+        bone_data = {}
+
+        # (关键帧索引键, 采样数据键, 输出键)
+        for keyframe_key, sample_key, output_key in (
+            ('location', 'position', 'position'),
+            ('rotation', 'rotation', 'rotation'),
+            ('scale', 'scale', 'scale'),
+        ):
+            if not keyframes[keyframe_key]:
+                continue
+            channel_data = self._build_channel_data(
+                keyframes[keyframe_key], samples, sample_key
+            )
+            if channel_data:
+                bone_data[output_key] = channel_data
 
         return bone_data
 
     def export_animation(self, animation_name: str) -> Dict[str, Any]:
         """导出完整动画"""
-        frame_start = bpy.context.scene.frame_start
-        frame_end = bpy.context.scene.frame_end
+        frame_start = self._scene.frame_start
+        frame_end = self._scene.frame_end
 
         # 计算动画长度（秒）
         # mcblend 使用 (frame_end - 1) / fps，因为帧1对应时间0
         animation_length = (frame_end - 1) / self.fps
 
-        # 保存当前帧
-        original_frame = bpy.context.scene.frame_current
-
-        try:
-            # 停止动画播放
-            bpy.ops.screen.animation_cancel()
-
-            bones_data = {}
-
-            # 遍历所有骨骼
-            for pose_bone in self.armature.pose.bones:
-                bone_name = pose_bone.name
-                bone_animation = self.export_bone_animation(bone_name, frame_start, frame_end)
-
-                if bone_animation:  # 只添加有动画数据的骨骼
-                    bones_data[bone_name] = bone_animation
-
-            # 构建动画数据结构
-            animation_data = {
-                'animation_length': round(animation_length, ANIMATION_TIMESTAMP_PRECISION),
-                'bones': bones_data
-            }
+        # 采样完全基于 fcurve 求值，不触碰时间线，
+        # 因此无需停止播放、保存/恢复当前帧
 
-            return animation_data
+        # 第一遍：收集所有骨骼的关键帧信息
+        bones_keyframes = {
+            pose_bone.name: self.get_bone_keyframes(pose_bone.name)
+            for pose_bone in self.armature.pose.bones
+        }
 
-        finally:
-            # 恢复原始帧
-            bpy.context.scene.frame_set(original_frame)
+        # 范围过滤：只保留导出范围内的关键帧
+        for keyframes in bones_keyframes.values():
+            for transform_type in keyframes:
+                keyframes[transform_type] = {
+                    frame: interp
+                    for frame, interp in keyframes[transform_type].items()
+                    if frame_start <= frame <= frame_end
+                }
+
+        # 第二遍：采样所有 (骨骼, 帧) 组合
+        samples = self.collect_samples(bones_keyframes)
+
+        # 第三遍：组装 JSON 数据
+        bones_data = {}
+        for bone_name, keyframes in bones_keyframes.items():
+            bone_animation = self.export_bone_animation(
+                bone_name, keyframes, samples.get(bone_name, {})
+            )
+
+            if bone_animation:  # 只添加有动画数据的骨骼
+                bones_data[bone_name] = bone_animation
+
+        # 构建动画数据结构
+        return {
+            'animation_length': round(animation_length, ANIMATION_TIMESTAMP_PRECISION),
+            'bones': bones_data
+        }
 
 
 class EXPORT_OT_bedrock_anim(bpy.types.Operator, ExportHelper):
@@ -403,41 +627,41 @@ class EXPORT_OT_bedrock_anim(bpy.types.Operator, ExportHelper):
             obj.animation_data_create()
 
         try:
-            result = {
-                'format_version': '1.8.0',
-                'animations': {}
-            }
-
             original_action = obj.animation_data.action
             exported_count = 0
 
-            # 导出所有动作
-            for action in bpy.data.actions:
-                # 设置当前动作
-                obj.animation_data.action = action
+            # 复用同一个导出器，避免每个 Action 重新构建
+            exporter = BBAnimExporter(obj)
 
-                # 创建导出器
-                exporter = BBAnimExporter(obj)
+            # 逐个动作导出并流式写入文件，
+            # 内存峰值从所有动画之和降到单个动画
+            with open(self.filepath, 'w', encoding='utf-8') as f:
+                f.write('{\n  "format_version": "1.8.0",\n  "animations": {')
+
+                for action in bpy.data.actions:
+                    # 设置当前动作（同时重建 fcurve 索引）
+                    exporter.set_action(action)
+
+                    # 获取动画名称
+                    anim_name = action.name
+                    if anim_name.startswith('animation.'):
+                        anim_name = anim_name[10:]
 
-                # 获取动画名称
-                anim_name = action.name
-                if anim_name.startswith('animation.'):
-                    anim_name = anim_name[10:]
+                    # 导出动画
+                    animation_data = exporter.export_animation(anim_name)
 
-                # 导出动画
-                animation_data = exporter.export_animation(anim_name)
+                    key = json.dumps(f'animation.{anim_name}')
+                    # 将整块动画 JSON 再缩进两级，保持文件整体缩进一致
+                    chunk = dumps_json(animation_data).replace('\n', '\n    ')
+                    separator = ',' if exported_count else ''
+                    f.write(f'{separator}\n    {key}: {chunk}')
+                    exported_count += 1
 
-                full_name = f'animation.{anim_name}'
-                result['animations'][full_name] = animation_data
-                exported_count += 1
+                f.write('\n  }\n}')
 
             # 恢复原始动作
             obj.animation_data.action = original_action
 
-            # 写入文件
-            with open(self.filepath, 'w', encoding='utf-8') as f:
-                json.dump(result, f, indent=2, ensure_ascii=False)
-
             self.report({'INFO'}, f"已导出 {exported_count} 个动画到 {self.filepath}")
             return {'FINISHED'}
 
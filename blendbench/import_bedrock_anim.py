@@ -1,11 +1,96 @@
 import bpy
 import json
-from mathutils import Euler, Vector
 import math
-from decimal import Decimal, ROUND_HALF_UP
+import os
+import numpy as np
 from bpy.props import StringProperty
 from bpy_extras.io_utils import ImportHelper
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# keyframe_points 的 interpolation 枚举值: LINEAR
+_KEYFRAME_INTERP_LINEAR = 1
+
+
+def load_json_file(filepath):
+    """读取并解析 JSON 文件，优先使用 orjson（大文件解析快数倍）"""
+    if orjson is not None:
+        with open(filepath, "rb") as f:
+            return orjson.loads(f.read())
+    with open(filepath, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+# (filepath, mtime) -> 解析结果，避免 draw() 每次重绘都重新解析整个文件
+_json_file_cache = {}
+
+
+def iter_animation_names(filepath):
+    """只枚举文件中的动画名，不把全部关键帧数据解析成 Python 对象
+
+    有 ijson 时流式扫描 JSON 事件，内存占用与动画数量无关；
+    否则退回到完整解析（结果仍会进缓存）。
+    """
+    if ijson is not None:
+        with open(filepath, "rb") as f:
+            for prefix, event, value in ijson.parse(f):
+                if prefix == "animations" and event == "map_key":
+                    yield value
+        return
+    yield from load_json_file(filepath).get("animations", {})
+
+
+def load_single_animation(filepath, animation_name):
+    """只解析指定名称的一个动画，找不到时返回 None"""
+    if ijson is not None:
+        with open(filepath, "rb") as f:
+            for name, value in ijson.kvitems(f, "animations"):
+                if name == animation_name:
+                    return value
+        return None
+    return load_json_file(filepath).get("animations", {}).get(animation_name)
+
+
+def load_json_file_cached(filepath):
+    """带缓存的 JSON 读取，文件未修改时直接返回上次的解析结果"""
+    mtime = os.path.getmtime(filepath)
+    cached = _json_file_cache.get(filepath)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    data = load_json_file(filepath)
+    _json_file_cache.clear()
+    _json_file_cache[filepath] = (mtime, data)
+    return data
+
+
+def euler_xzy_to_quaternion_batch(eulers):
+    """批量把 XZY 顺序的欧拉角（弧度，(N, 3)）转换为四元数 (N, 4) wxyz
+
+    XZY 顺序对应 R = Ry·Rz·Rx，即 q = qy ⊗ qz ⊗ qx，
+    展开后可以直接用 NumPy 按列计算，避免逐帧构造 mathutils.Euler。
+    """
+    half = 0.5 * np.asarray(eulers, dtype=np.float64)
+    cx, cy, cz = np.cos(half[:, 0]), np.cos(half[:, 1]), np.cos(half[:, 2])
+    sx, sy, sz = np.sin(half[:, 0]), np.sin(half[:, 1]), np.sin(half[:, 2])
+
+    return np.stack(
+        (
+            cy * cz * cx - sy * sz * sx,
+            cy * cz * sx + sy * sz * cx,
+            cy * sz * sx + sy * cz * cx,
+            cy * sz * cx - sy * cz * sx,
+        ),
+        axis=1,
+    )
+
 
 class BBAnimImporter:
     """Bedrock/Blockbench 动画导入器"""
@@ -13,22 +98,29 @@ class BBAnimImporter:
     def __init__(self, armature_name):
         self.armature_name = armature_name
         self.armature = None
+        self.pose_bones = {}
         self.fps = 24
         self.position_scale = 1.0 / 16.0  # Blockbench: 16单位 = 1米
         self.timestamp_precision = 2
+        # 每骨骼/每动画的调试输出，默认关闭（控制台 I/O 在大文件上很可观）
+        self.verbose = False
+        # 轴转换: blender (x, y, z) = (mc_x, mc_z, -mc_y)，位置不变号
+        self._axis_perm = np.array([0, 2, 1])
+        self._rot_sign = np.array([1.0, 1.0, -1.0])
 
     def load_animation_file(self, filepath):
-        with open(filepath, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return load_json_file(filepath)
 
     def setup_armature(self):
         self.armature = bpy.data.objects[self.armature_name]
+        # 缓存为普通字典，绕开 pose.bones 每次按名查找的 RNA 开销
+        self.pose_bones = {bone.name: bone for bone in self.armature.pose.bones}
         bpy.context.view_layer.objects.active = self.armature
         bpy.ops.object.mode_set(mode="POSE")
 
     def reset_pose(self):
         """重置骨骼姿态到默认状态"""
-        for bone in self.armature.pose.bones:
+        for bone in self.pose_bones.values():
             bone.rotation_mode = "QUATERNION"
             bone.rotation_quaternion = (1, 0, 0, 0)
             bone.location = (0, 0, 0)
@@ -41,30 +133,19 @@ class BBAnimImporter:
         # 创建新 Action，使用动画名称
         action = bpy.data.actions.new(name=animation_name)
         self.armature.animation_data.action = action
-        print(f"创建新Action: {action.name}")
+        if self.verbose:
+            print(f"创建新Action: {action.name}")
         return action
 
-    def degrees_to_radians(self, degrees_array):
-        return [math.radians(deg) for deg in degrees_array]
-
     def t_to_frame(self, time_float):
-        time_decimal = Decimal(str(time_float))
-        fps_decimal = Decimal(str(self.fps))
-        frame_decimal = time_decimal * fps_decimal + Decimal("1")
-        frame = int(frame_decimal.quantize(Decimal("1"), rounding=ROUND_HALF_UP))
-        return frame
-
-    def convert_rotation_axis(self, rotation):
-        """将 Blockbench 旋转轴转换为 Blender 坐标系"""
-        return [rotation[0], rotation[2], -rotation[1]]
-
-    def convert_position_axis(self, position):
-        """将 Blockbench 位置轴转换为 Blender 坐标系（含缩放）"""
-        return [
-            position[0] * self.position_scale,
-            position[2] * self.position_scale,
-            position[1] * self.position_scale,
-        ]
+        # 等价于原来基于 Decimal 的 ROUND_HALF_UP，但不再每次构造 Decimal 对象；
+        # 先按 9 位小数修正浮点误差，保证 x.5 的平局仍然向上取整
+        return math.floor(round(time_float * self.fps, 9) + 1.5)
+
+    def convert_positions(self, positions):
+        """批量将 Blockbench 位置 (N, 3) 转换为 Blender 坐标系（含缩放）"""
+        arr = np.asarray(positions, dtype=np.float64)
+        return arr[:, self._axis_perm] * self.position_scale
 
     def parse_keyframe_value(self, value):
         """解析关键帧值，支持直接数组或带 post/pre 的字典格式"""
@@ -74,69 +155,98 @@ class BBAnimImporter:
             return value.get("post") or value.get("pre") or [0, 0, 0]
         return [0, 0, 0]
 
-    def process_bone_animation_data(self, bone_name, bone_data, animation_length):
-        if "rotation" in bone_data:
-            rotation_data = bone_data["rotation"]
+    def rotations_to_quaternions(self, rotations_deg):
+        """批量把 Blockbench 旋转（角度制，(N, 3)）转换为 Blender 四元数 (N, 4)"""
+        rot_rad = np.deg2rad(np.asarray(rotations_deg, dtype=np.float64))
+        eulers = rot_rad[:, self._axis_perm] * self._rot_sign
+        return euler_xzy_to_quaternion_batch(eulers)
+
+    def process_bone_animation_data(self, bone_name, bone_data, end_frame, action):
+        rotation_keys = []
+        position_keys = []
+
+        rotation_data = bone_data.get("rotation")
+        if rotation_data is not None:
             if isinstance(rotation_data, list):
-                frame = 1
-                rotation = rotation_data
-                self.set_keyframe(bone_name, frame, rotation=rotation)
-                end_frame = self.t_to_frame(animation_length)
-                self.set_keyframe(bone_name, end_frame, rotation=rotation)
+                rotation_keys.append((1, rotation_data))
+                rotation_keys.append((end_frame, rotation_data))
             elif isinstance(rotation_data, dict):
                 for time_str, rotation_value in rotation_data.items():
-                    time_float = float(time_str)
-                    frame = self.t_to_frame(time_float)
+                    frame = self.t_to_frame(float(time_str))
                     rotation = self.parse_keyframe_value(rotation_value)
-                    self.set_keyframe(bone_name, frame, rotation=rotation)
+                    rotation_keys.append((frame, rotation))
 
-        if "position" in bone_data:
-            position_data = bone_data["position"]
+        position_data = bone_data.get("position")
+        if position_data is not None:
             if isinstance(position_data, list):
-                frame = 1
-                position = position_data
-                self.set_keyframe(bone_name, frame, position=position)
-                end_frame = self.t_to_frame(animation_length)
-                self.set_keyframe(bone_name, end_frame, position=position)
+                position_keys.append((1, position_data))
+                position_keys.append((end_frame, position_data))
             elif isinstance(position_data, dict):
                 for time_str, position_value in position_data.items():
-                    time_float = float(time_str)
-                    frame = self.t_to_frame(time_float)
+                    frame = self.t_to_frame(float(time_str))
                     position = self.parse_keyframe_value(position_value)
-                    self.set_keyframe(bone_name, frame, position=position)
+                    position_keys.append((frame, position))
 
-    def set_keyframe(self, bone_name, frame, rotation=None, position=None):
-        if bone_name not in self.armature.pose.bones:
-            print(f"警告: 骨骼 {bone_name} 不存在")
+        if rotation_keys:
+            quaternions = self.rotations_to_quaternions(
+                [rotation for _, rotation in rotation_keys]
+            )
+            rotation_keys = [
+                (frame, quaternions[i]) for i, (frame, _) in enumerate(rotation_keys)
+            ]
+            self.write_channel_fcurves(
+                action, bone_name, "rotation_quaternion", rotation_keys
+            )
+        if position_keys:
+            positions = self.convert_positions(
+                [position for _, position in position_keys]
+            )
+            position_keys = [
+                (frame, positions[i]) for i, (frame, _) in enumerate(position_keys)
+            ]
+            self.write_channel_fcurves(action, bone_name, "location", position_keys)
+
+    def write_channel_fcurves(self, action, bone_name, attr, keys):
+        """把一个通道的所有关键帧一次性批量写入 fcurve
+
+        相比逐帧 keyframe_insert（每次插入都会重排关键帧并更新句柄），
+        先 add(N) 再用 foreach_set 整块写入只有一次分配和一次 update。
+        """
+        if not keys:
             return
 
-        bone = self.armature.pose.bones[bone_name]
-        bpy.context.scene.frame_set(frame)
-
-        if rotation is not None:
-            bone.rotation_mode = "QUATERNION"
-            rot_rad = self.degrees_to_radians(rotation)
-            converted_rot = self.convert_rotation_axis(rot_rad)
-            euler = Euler(converted_rot, "XZY")
-            bone.rotation_quaternion = euler.to_quaternion()
-
-        if position is not None:
-            converted_pos = self.convert_position_axis(position)
-            bone.location = Vector(converted_pos)
-
-        bpy.context.view_layer.update()
-
-        if rotation is not None:
-            bone.keyframe_insert(
-                data_path="rotation_quaternion", frame=frame, group=bone_name
+        frames = np.array([item[0] for item in keys], dtype=np.float64)
+        values = np.array([item[1] for item in keys], dtype=np.float64)
+        # 预先按帧号排序再整块写入，Blender 不会再内部重排
+        order = np.argsort(frames, kind="stable")
+        frames = frames[order]
+        values = values[order]
+        # 多个时间戳可能取整到同一帧；fcurve.update() 只排序不去重，
+        # 同帧保留最后一个值，与逐帧 keyframe_insert 的覆盖语义一致
+        keep = np.empty(frames.shape[0], dtype=bool)
+        keep[:-1] = frames[1:] != frames[:-1]
+        keep[-1] = True
+        frames = frames[keep]
+        values = values[keep]
+        count = frames.shape[0]
+        interpolations = np.full(count, _KEYFRAME_INTERP_LINEAR, dtype=np.int32)
+
+        data_path = f'pose.bones["{bone_name}"].{attr}'
+        for index in range(values.shape[1]):
+            fcurve = action.fcurves.new(
+                data_path, index=index, action_group=bone_name
             )
-
-        if position is not None:
-            bone.keyframe_insert(data_path="location", frame=frame, group=bone_name)
+            fcurve.keyframe_points.add(count)
+            fcurve.keyframe_points.foreach_set(
+                "co", np.column_stack((frames, values[:, index])).ravel()
+            )
+            fcurve.keyframe_points.foreach_set("interpolation", interpolations)
+            fcurve.update()
 
     def import_animation(self, animation_data, animation_name):
         """导入单个动画到一个新的 Action"""
-        print(f"开始导入动画: {animation_name}")
+        if self.verbose:
+            print(f"开始导入动画: {animation_name}")
 
         # 重置骨骼姿态
         self.reset_pose()
@@ -146,42 +256,52 @@ class BBAnimImporter:
 
         animation_length = animation_data.get("animation_length", 1.0)
         end_frame = self.t_to_frame(animation_length)
-        print(f"动画长度: {animation_length} 秒, {end_frame} 帧")
 
         bones_data = animation_data.get("bones", {})
-        print(f"处理 {len(bones_data)} 个骨骼的动画数据")
+        missing_bones = []
 
         for bone_name, bone_data in bones_data.items():
-            print(f"\n处理骨骼: {bone_name}")
-            if bone_name in self.armature.pose.bones:
-                self.process_bone_animation_data(bone_name, bone_data, animation_length)
+            if bone_name in self.pose_bones:
+                self.process_bone_animation_data(
+                    bone_name, bone_data, end_frame, action
+                )
             else:
-                print(f"  跳过: 骨骼 {bone_name} 不存在于armature中")
+                missing_bones.append(bone_name)
 
         # 设置 Action 的帧范围
         action.frame_start = 1
         action.frame_end = end_frame
 
-        print(f"动画 {animation_name} 导入完成!")
+        # 缺失骨骼每个动画只汇总提示一次，不在循环里逐条打印
+        if missing_bones:
+            print(
+                f"动画 {animation_name}: 跳过 {len(missing_bones)} 个"
+                f"不存在于armature中的骨骼: {', '.join(missing_bones)}"
+            )
+        if self.verbose:
+            print(
+                f"动画 {animation_name} 导入完成! "
+                f"({animation_length} 秒, {end_frame} 帧, {len(bones_data)} 个骨骼)"
+            )
         return action
 
     def list_animations(self, filepath):
-        data = self.load_animation_file(filepath)
-        animations = data.get("animations", {})
-        return list(animations.keys())
+        return list(iter_animation_names(filepath))
 
     def import_specific_animation(self, filepath, animation_name):
-        data = self.load_animation_file(filepath)
-        animations = data.get("animations", {})
-        if animation_name in animations:
-            anim_data = animations[animation_name]
+        anim_data = load_single_animation(filepath, animation_name)
+        if anim_data is not None:
+            self.setup_armature()
             self.import_animation(anim_data, animation_name)
             return True
         return False
 
     def import_all_animations(self, filepath):
         """导入文件中的所有动画，每个动画作为单独的 Action"""
-        data = self.load_animation_file(filepath)
+        return self.import_all_from_data(self.load_animation_file(filepath))
+
+    def import_all_from_data(self, data):
+        """从已解析的动画数据导入所有动画，每个动画作为单独的 Action"""
         animations = data.get("animations", {})
 
         if not animations:
@@ -191,11 +311,10 @@ class BBAnimImporter:
         self.setup_armature()
 
         imported_actions = []
-        animation_names = list(animations.keys())
-        print(f"找到 {len(animation_names)} 个动画，开始导入...")
+        if self.verbose:
+            print(f"找到 {len(animations)} 个动画，开始导入...")
 
-        for animation_name in animation_names:
-            anim_data = animations[animation_name]
+        for animation_name, anim_data in animations.items():
             action = self.import_animation(anim_data, animation_name)
             imported_actions.append(action)
 
@@ -206,7 +325,7 @@ class BBAnimImporter:
         # 重置骨骼姿态
         self.reset_pose()
 
-        print(f"\n全部导入完成！共导入 {len(imported_actions)} 个动画")
+        print(f"全部导入完成！共导入 {len(imported_actions)} 个动画")
         return imported_actions
 
 
@@ -245,8 +364,7 @@ class IMPORT_OT_bedrock_anim(bpy.types.Operator, ImportHelper):
             box = layout.box()
             box.label(text="将导入以下动画:")
             try:
-                with open(self.filepath, "r", encoding="utf-8") as f:
-                    data = json.load(f)
+                data = load_json_file_cached(self.filepath)
                 animations = data.get("animations", {})
                 if animations:
                     for name in animations.keys():
@@ -266,7 +384,8 @@ class IMPORT_OT_bedrock_anim(bpy.types.Operator, ImportHelper):
 
         try:
             importer = BBAnimImporter(armature.name)
-            imported_actions = importer.import_all_animations(self.filepath)
+            data = load_json_file_cached(self.filepath)
+            imported_actions = importer.import_all_from_data(data)
 
             if imported_actions:
                 self.report(
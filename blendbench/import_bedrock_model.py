@@ -7,15 +7,27 @@ from __future__ import annotations
 
 import math
 import json
+from functools import lru_cache
+from operator import itemgetter
 from typing import Dict, List, Any, Optional, Tuple, cast
 from dataclasses import dataclass, field
 
+import numpy as np
+
 import bpy
 from bpy.types import Object, Armature, Mesh, MeshUVLoopLayer, ArmatureEditBones
 from bpy.props import StringProperty
 from bpy_extras.io_utils import ImportHelper
 import mathutils
 
+from .import_bedrock_anim import load_json_file
+
+try:
+    # 可选依赖：numba 可将 UV 转换内核 JIT 编译
+    from numba import njit
+except ImportError:
+    njit = None
+
 
 # ============================================================================
 # 常量定义
@@ -24,15 +36,23 @@ import mathutils
 MINECRAFT_SCALE_FACTOR = 16.0
 """Minecraft 缩放因子: 16 单位 = 1 米"""
 
+_INV_SCALE = 1.0 / MINECRAFT_SCALE_FACTOR
+"""预计算的缩放倒数，把热路径上的除法换成乘法"""
+
 
 # ============================================================================
 # 类型别名
 # ============================================================================
 
-Vector3d = Tuple[float, float, float]
+Vector3d = np.ndarray
 Vector2d = Tuple[float, float]
 
 
+def _vec3(data: Dict[str, Any], key: str, default=(0.0, 0.0, 0.0)) -> Vector3d:
+    """把 JSON 中的三维向量字段直接解析为 float32 数组，跳过中间元组"""
+    return np.asarray(data.get(key, default), dtype=np.float32)
+
+
 # ============================================================================
 # 异常定义
 # ============================================================================
@@ -42,6 +62,30 @@ class ImporterException(Exception):
     pass
 
 
+@lru_cache(maxsize=64)
+def _parse_version(version: str) -> Tuple[int, int]:
+    """把版本字符串解析为 (major, minor) 元组，结果按字符串缓存"""
+    parts = version.split(".")
+    try:
+        major = int(parts[0])
+        minor = int(parts[1]) if len(parts) >= 2 else 0
+    except ValueError:
+        return (0, 0)
+    return (major, minor)
+
+
+if njit is not None:
+
+    @njit(cache=True, fastmath=True)
+    def _convert_uvs_kernel(uvs, inv_w, inv_h, out):  # pragma: no cover - 需要 numba
+        for i in range(uvs.shape[0]):
+            out[i, 0] = uvs[i, 0] * inv_w
+            out[i, 1] = 1.0 - uvs[i, 1] * inv_h
+
+else:
+    _convert_uvs_kernel = None
+
+
 # ============================================================================
 # UV 坐标转换器
 # ============================================================================
@@ -54,19 +98,68 @@ class CoordinatesConverter:
     def __init__(self, texture_width: int, texture_height: int):
         self.texture_width = texture_width
         self.texture_height = texture_height
+        # 预计算倒数，把每个 UV 点的两次除法换成两次乘法
+        self._inv_w = 1.0 / texture_width
+        self._inv_h = 1.0 / texture_height
 
     def convert(self, uv: Tuple[float, float]) -> Tuple[float, float]:
         """将 Minecraft UV 坐标转换为 Blender UV 坐标"""
-        u = uv[0] / self.texture_width
-        v = 1.0 - (uv[1] / self.texture_height)  # Blender UV Y 轴翻转
+        u = uv[0] * self._inv_w
+        v = 1.0 - uv[1] * self._inv_h  # Blender UV Y 轴翻转
         return (u, v)
 
+    def convert_many(self, uvs: "np.ndarray") -> "np.ndarray":
+        """批量转换 (N, 2) 的 Minecraft UV 坐标为 Blender UV 坐标"""
+        uvs = np.asarray(uvs, dtype=np.float64)
+        result = np.empty_like(uvs)
+        if _convert_uvs_kernel is not None:
+            _convert_uvs_kernel(uvs, self._inv_w, self._inv_h, result)
+        else:
+            result[:, 0] = uvs[:, 0] * self._inv_w
+            result[:, 1] = 1.0 - uvs[:, 1] * self._inv_h
+        return result
+
+
+@lru_cache(maxsize=1024)
+def _create_default_uv_cached(
+    width: int, height: int, depth: int, mirror: bool, u: float, v: float
+) -> Dict[str, Any]:
+    """按 (尺寸, mirror, uv) 缓存的默认 UV 布局
+
+    同一模型里大量方块共享相同的尺寸和 UV 起点（平铺方块），缓存后每种
+    组合只构建一次面字典。返回值被下游只读使用，调用方不得修改。
+    """
+
+    def _face(uv_size: Tuple, uv_pos: Tuple) -> Dict:
+        return {"uv_size": uv_size, "uv": uv_pos}
+
+    face1 = _face((depth, height), (u, v + depth))
+    face2 = _face((width, height), (u + depth, v + depth))
+    face3 = _face((depth, height), (u + depth + width, v + depth))
+    face4 = _face((width, height), (u + 2 * depth + width, v + depth))
+    face5 = _face((width, depth), (u + depth, v))
+    face6 = _face((width, -depth), (u + depth + width, v + depth))
+
+    if mirror:
+        face_west, face_east = face1, face3
+    else:
+        face_east, face_west = face1, face3
+
+    return {
+        "north": face2,
+        "south": face4,
+        "east": face_east,
+        "west": face_west,
+        "up": face5,
+        "down": face6,
+    }
+
 
 # ============================================================================
 # 数据类定义
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class ImportLocator:
     """表示 Minecraft 定位器"""
     name: str
@@ -75,7 +168,7 @@ class ImportLocator:
     blend_empty: Optional[Object] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ImportCube:
     """表示 Minecraft 方块"""
     origin: Vector3d
@@ -88,7 +181,7 @@ class ImportCube:
     blend_cube: Optional[Object] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ImportBone:
     """表示 Minecraft 骨骼"""
     name: str
@@ -122,15 +215,13 @@ class ModelLoader:
         """检测模型格式版本"""
         if "format_version" in self.data:
             version = self.data["format_version"]
-            # 解析版本号并选择合适的解析器
+            # 解析版本号并选择合适的解析器（元组比较可正确排序 2.x 等未来版本）
             if isinstance(version, str):
-                parts = version.split(".")
-                if len(parts) >= 2:
-                    major, minor = int(parts[0]), int(parts[1])
-                    if major >= 1 and minor >= 16:
-                        return "1.16.0"
-                    elif major >= 1 and minor >= 12:
-                        return "1.12.0"
+                ver = _parse_version(version)
+                if ver >= (1, 16):
+                    return "1.16.0"
+                if ver >= (1, 12):
+                    return "1.12.0"
             return "1.8.0"
         elif "minecraft:geometry" in self.data:
             return "1.16.0"
@@ -178,41 +269,30 @@ class ModelLoader:
 
     def _load_description(self) -> Dict[str, Any]:
         """加载模型描述信息"""
-        result = {
-            "identifier": "geometry.unknown",
-            "texture_width": 64,
-            "texture_height": 64,
+        desc = self.geometry.get("description", {})
+
+        if self.format_version in ("1.16.0", "1.12.0"):
+            return {
+                "identifier": desc.get("identifier", "geometry.unknown"),
+                "texture_width": int(desc.get("texture_width", 64)),
+                "texture_height": int(desc.get("texture_height", 64)),
+                "visible_bounds_offset": desc.get(
+                    "visible_bounds_offset", [0.0, 0.0, 0.0]
+                ),
+                "visible_bounds_width": float(desc.get("visible_bounds_width", 1.0)),
+                "visible_bounds_height": float(desc.get("visible_bounds_height", 1.0)),
+            }
+
+        # 1.8.0 使用根级的 texturewidth/textureheight
+        return {
+            "identifier": desc.get("identifier", "geometry.unknown"),
+            "texture_width": int(self.geometry.get("texturewidth", 64)),
+            "texture_height": int(self.geometry.get("textureheight", 64)),
             "visible_bounds_offset": [0.0, 0.0, 0.0],
             "visible_bounds_width": 1.0,
             "visible_bounds_height": 1.0,
         }
 
-        if self.format_version in ("1.16.0", "1.12.0"):
-            desc = self.geometry.get("description", {})
-            if "identifier" in desc:
-                result["identifier"] = desc["identifier"]
-            if "texture_width" in desc:
-                result["texture_width"] = int(desc["texture_width"])
-            if "texture_height" in desc:
-                result["texture_height"] = int(desc["texture_height"])
-            if "visible_bounds_offset" in desc:
-                result["visible_bounds_offset"] = desc["visible_bounds_offset"]
-            if "visible_bounds_width" in desc:
-                result["visible_bounds_width"] = float(desc["visible_bounds_width"])
-            if "visible_bounds_height" in desc:
-                result["visible_bounds_height"] = float(desc["visible_bounds_height"])
-
-        elif self.format_version == "1.8.0":
-            desc = self.geometry.get("description", {})
-            result["identifier"] = desc.get("identifier", "geometry.unknown")
-            # 1.8.0 使用 texturewidth/textureheight
-            if "texturewidth" in self.geometry:
-                result["texture_width"] = int(self.geometry["texturewidth"])
-            if "textureheight" in self.geometry:
-                result["texture_height"] = int(self.geometry["textureheight"])
-
-        return result
-
     def _load_bones(self) -> List[Dict[str, Any]]:
         """加载骨骼列表"""
         bones_data = self.geometry.get("bones", [])
@@ -230,8 +310,8 @@ class ModelLoader:
         result = {
             "name": bone.get("name", "unnamed"),
             "parent": bone.get("parent"),
-            "pivot": bone.get("pivot", [0, 0, 0]),
-            "rotation": bone.get("rotation", [0, 0, 0]),
+            "pivot": _vec3(bone, "pivot"),
+            "rotation": _vec3(bone, "rotation"),
             "mirror": bone.get("mirror", False),
             "inflate": bone.get("inflate", 0.0),
             "cubes": [],
@@ -260,14 +340,14 @@ class ModelLoader:
         self, cube: Dict[str, Any], default_mirror: bool, default_inflate: float
     ) -> Dict[str, Any]:
         """加载单个方块"""
-        size = tuple(cube.get("size", [0, 0, 0]))
+        size = _vec3(cube, "size")
         mirror = cube.get("mirror", default_mirror)
 
         result = {
-            "origin": tuple(cube.get("origin", [0, 0, 0])),
+            "origin": _vec3(cube, "origin"),
             "size": size,
-            "pivot": tuple(cube.get("pivot", [0, 0, 0])),
-            "rotation": tuple(cube.get("rotation", [0, 0, 0])),
+            "pivot": _vec3(cube, "pivot"),
+            "rotation": _vec3(cube, "rotation"),
             "inflate": cube.get("inflate", default_inflate),
             "mirror": mirror,
             "uv": self._load_cube_uv(cube, size, mirror),
@@ -295,31 +375,10 @@ class ModelLoader:
         self, size: Tuple, mirror: bool, uv: Tuple[float, float]
     ) -> Dict[str, Any]:
         """创建默认的 UV 映射（标准 Minecraft 方块 UV 布局）"""
-        width, height, depth = int(size[0]), int(size[1]), int(size[2])
-
-        def _face(uv_size: Tuple, uv_pos: Tuple) -> Dict:
-            return {"uv_size": uv_size, "uv": uv_pos}
-
-        face1 = _face((depth, height), (uv[0], uv[1] + depth))
-        face2 = _face((width, height), (uv[0] + depth, uv[1] + depth))
-        face3 = _face((depth, height), (uv[0] + depth + width, uv[1] + depth))
-        face4 = _face((width, height), (uv[0] + 2 * depth + width, uv[1] + depth))
-        face5 = _face((width, depth), (uv[0] + depth, uv[1]))
-        face6 = _face((width, -depth), (uv[0] + depth + width, uv[1] + depth))
-
-        if mirror:
-            face_west, face_east = face1, face3
-        else:
-            face_east, face_west = face1, face3
-
-        return {
-            "north": face2,
-            "south": face4,
-            "east": face_east,
-            "west": face_west,
-            "up": face5,
-            "down": face6,
-        }
+        return _create_default_uv_cached(
+            int(size[0]), int(size[1]), int(size[2]),
+            bool(mirror), float(uv[0]), float(uv[1]),
+        )
 
     def _load_per_face_uv(self, uv: Dict[str, Any], size: Tuple) -> Dict[str, Any]:
         """加载每面独立的 UV 映射"""
@@ -361,6 +420,57 @@ class ModelLoader:
         return result
 
 
+# ============================================================================
+# 网格模板
+# ============================================================================
+
+# 与 primitive_cube_add 相同的顶点序（0. ---; 1. --+; ... 7. +++）和面序，
+# 保证 _mc_set_size / _set_cube_uv 的索引约定不变
+_CUBE_VERTICES = (
+    (-0.5, -0.5, -0.5), (-0.5, -0.5, 0.5), (-0.5, 0.5, -0.5), (-0.5, 0.5, 0.5),
+    (0.5, -0.5, -0.5), (0.5, -0.5, 0.5), (0.5, 0.5, -0.5), (0.5, 0.5, 0.5),
+)
+_CUBE_FACES = (
+    (0, 1, 3, 2), (2, 3, 7, 6), (6, 7, 5, 4),
+    (4, 5, 1, 0), (2, 6, 4, 0), (7, 3, 1, 5),
+)
+
+# 顶点符号模板 (8, 3)，乘以半尺寸即得立方体顶点坐标
+_CUBE_SIGNS = np.array(_CUBE_VERTICES, dtype=np.float32) * 2.0
+
+# Minecraft [X, Y, Z] -> Blender [X, Z, Y] 的列置换
+_SWAP_YZ = np.array([0, 2, 1])
+
+# 换系后旋转各轴的符号: [X, Y, Z] -> [X, Z, -Y]
+_ROT_SIGN = np.array([1.0, 1.0, -1.0])
+
+# 立方体多边形索引 -> Minecraft 面名
+# Blender 立方体面的顺序: 前(+Y), 后(-Y), 右(+X), 左(-X), 上(+Z), 下(-Z)
+# Minecraft 面的顺序: north(-Y), south(+Y), east(+X), west(-X), up(+Z), down(-Z)
+_FACE_MAPPING = ("south", "north", "east", "west", "up", "down")
+
+# 四个角相对 uv 起点的 (u, v) 系数: 左下, 右下, 右上, 左上
+_CORNER_SIGNS = np.array(
+    [[0.0, 1.0], [1.0, 1.0], [1.0, 0.0], [0.0, 0.0]], dtype=np.float64
+)
+
+
+def _make_unit_cube_mesh() -> Mesh:
+    """创建单位立方体网格模板，供每个方块 copy() 复用"""
+    mesh = bpy.data.meshes.new("bb_cube")
+    mesh.from_pydata(list(_CUBE_VERTICES), [], list(_CUBE_FACES))
+    mesh.uv_layers.new()
+    mesh.update()
+    return mesh
+
+
+# ImportCube / ImportLocator 构造参数的批量取值器，与数据类字段顺序一致
+_CUBE_FIELDS = itemgetter(
+    "origin", "size", "pivot", "rotation", "inflate", "mirror", "uv"
+)
+_LOCATOR_FIELDS = itemgetter("offset", "rotation")
+
+
 # ============================================================================
 # 几何体导入器
 # ============================================================================
@@ -391,35 +501,18 @@ class ImportGeometry:
 
     def _create_import_bone(self, data: Dict[str, Any]) -> ImportBone:
         """创建 ImportBone 对象"""
-        cubes = []
-        for cube_data in data.get("cubes", []):
-            cubes.append(
-                ImportCube(
-                    origin=tuple(cube_data["origin"]),
-                    size=tuple(cube_data["size"]),
-                    pivot=tuple(cube_data["pivot"]),
-                    rotation=tuple(cube_data["rotation"]),
-                    inflate=cube_data["inflate"],
-                    mirror=cube_data["mirror"],
-                    uv=cube_data["uv"],
-                )
-            )
-
-        locators = []
-        for name, loc_data in data.get("locators", {}).items():
-            locators.append(
-                ImportLocator(
-                    name=name,
-                    position=tuple(loc_data["offset"]),
-                    rotation=tuple(loc_data["rotation"]),
-                )
-            )
+        # itemgetter 一次取出全部字段，避免逐字段的字典查找
+        cubes = [ImportCube(*_CUBE_FIELDS(cd)) for cd in data.get("cubes", [])]
+        locators = [
+            ImportLocator(name, *_LOCATOR_FIELDS(ld))
+            for name, ld in data.get("locators", {}).items()
+        ]
 
         return ImportBone(
             name=data["name"],
             parent=data["parent"],
-            pivot=tuple(data["pivot"]),
-            rotation=tuple(data["rotation"]),
+            pivot=data["pivot"],
+            rotation=data["rotation"],
             mirror=data["mirror"],
             cubes=cubes,
             locators=locators,
@@ -470,82 +563,127 @@ class ImportGeometry:
 
     def _build_with_empties(self, context: bpy.types.Context) -> Object:
         """使用空对象构建骨骼结构"""
-        # 创建空骨架
-        bpy.ops.object.armature_add(enter_editmode=True, align="WORLD", location=[0, 0, 0])
-        bpy.ops.armature.select_all(action="SELECT")
-        bpy.ops.armature.delete()
-        bpy.ops.object.mode_set(mode="OBJECT")
+        # 直接用 bpy.data 创建空骨架，避免 armature_add + 全选删除的
+        # 操作符往返（每个 bpy.ops 调用都带撤销压栈和场景刷新）
+        armature_data = bpy.data.armatures.new(self.identifier)
+        armature: Object = bpy.data.objects.new(self.identifier, armature_data)
+        context.collection.objects.link(armature)
+        context.view_layer.objects.active = armature
+
+        # 共享一个单位立方体模板，每个方块只 copy() 网格数据，
+        # 不再为每个对象走一遍 bpy.ops 操作符管线
+        unit_cube = _make_unit_cube_mesh()
+        # 几何和 UV 完全一致的方块共享同一个网格数据块（链接复制）
+        mesh_cache: Dict[Any, Mesh] = {}
 
-        armature: Object = cast(Object, context.object)
+        bones = list(self.bones.values())
+
+        # 所有骨骼的枢轴与旋转一次性批量换系并缩放，
+        # 循环内只按行索引，不再逐骨骼做标量换算
+        if bones:
+            bone_pivots = (
+                np.array([b.pivot for b in bones], dtype=np.float64)[:, _SWAP_YZ]
+                * _INV_SCALE
+            )
+            bone_rots = (
+                np.deg2rad(
+                    np.array([b.rotation for b in bones], dtype=np.float64)
+                )[:, _SWAP_YZ]
+                * _ROT_SIGN
+            )
 
         # 创建骨骼对应的空对象和方块
-        for bone in self.bones.values():
+        for bone_idx, bone in enumerate(bones):
             # 创建骨骼空对象
-            bpy.ops.object.empty_add(type="SPHERE", location=[0, 0, 0], radius=0.2)
-            bone_obj: Object = cast(Object, context.object)
+            bone_obj = bpy.data.objects.new(bone.name, None)
+            bone_obj.empty_display_type = "SPHERE"
+            bone_obj.empty_display_size = 0.2
+            context.collection.objects.link(bone_obj)
             bone.blend_empty = bone_obj
-            self._mc_pivot(bone_obj, bone.pivot)
-            bone_obj.name = bone.name
+            bone_obj.location = bone_pivots[bone_idx]
 
             # 创建方块
             for cube in bone.cubes:
-                bpy.ops.mesh.primitive_cube_add(size=1, enter_editmode=False, location=[0, 0, 0])
-                cube_obj: Object = cast(Object, context.object)
+                key = self._cube_mesh_key(cube)
+                mesh = mesh_cache.get(key)
+                is_new_mesh = mesh is None
+                if is_new_mesh:
+                    mesh = unit_cube.copy()
+                    mesh_cache[key] = mesh
+
+                cube_obj = bpy.data.objects.new("cube", mesh)
+                context.collection.objects.link(cube_obj)
                 cube.blend_cube = cube_obj
 
-                # 设置 UV
-                if cube_obj.data.uv_layers.active is not None:
+                # 网格数据只在首次出现该签名时写 UV 和顶点
+                if is_new_mesh and cube_obj.data.uv_layers.active is not None:
                     self._set_cube_uv(cube_obj, cube)
-
-                # 设置大小和位置
-                self._mc_set_size(cube_obj, cube.size, cube.inflate)
-                self._mc_pivot(cube_obj, cube.pivot)
-                self._mc_translate(cube_obj, cube.origin, cube.size, cube.pivot)
+                self._emit_cube(cube_obj, cube, write_mesh=is_new_mesh)
 
             # 创建定位器
             for locator in bone.locators:
-                bpy.ops.object.empty_add(type="SPHERE", location=[0, 0, 0], radius=0.1)
-                locator_obj: Object = cast(Object, context.object)
+                locator_obj = bpy.data.objects.new(locator.name, None)
+                locator_obj.empty_display_type = "SPHERE"
+                locator_obj.empty_display_size = 0.1
+                context.collection.objects.link(locator_obj)
                 locator.blend_empty = locator_obj
                 self._mc_pivot(locator_obj, locator.position)
                 self._mc_rotate(locator_obj, locator.rotation)
-                locator_obj.name = locator.name
+
+        # 模板网格用完即删，避免残留孤儿数据块
+        bpy.data.meshes.remove(unit_cube)
+
+        # 父子关系建立前所有对象都未旋转、未父子化，世界矩阵解析上就是
+        # 自身位置的平移矩阵；按此计算 matrix_parent_inverse，
+        # 不必在循环里逐对象刷新依赖图来读取 matrix_world
+        world_mats = {
+            bone.name: mathutils.Matrix.Translation(
+                cast(Object, bone.blend_empty).location
+            )
+            for bone in self.bones.values()
+        }
+
+        # 每个骨骼的逆矩阵求一次，所有子对象共用，
+        # 不必每条父子边都 inverted() 一遍
+        inv_mats = {name: mat.inverted() for name, mat in world_mats.items()}
 
         # 设置父子关系（保持变换）
         for bone in self.bones.values():
             assert bone.blend_empty is not None
             bone_obj = bone.blend_empty
+            bone_inv = inv_mats[bone.name]
 
             # 骨骼父子关系
             if bone.parent is not None and bone.parent in self.bones:
                 parent_obj = cast(Object, self.bones[bone.parent].blend_empty)
-                context.view_layer.update()
                 bone_obj.parent = parent_obj
-                bone_obj.matrix_parent_inverse = parent_obj.matrix_world.inverted()
+                bone_obj.matrix_parent_inverse = inv_mats[bone.parent]
 
             # 方块父子关系
             for cube in bone.cubes:
                 cube_obj = cast(Object, cube.blend_cube)
-                context.view_layer.update()
                 cube_obj.parent = bone_obj
-                cube_obj.matrix_parent_inverse = bone_obj.matrix_world.inverted()
+                cube_obj.matrix_parent_inverse = bone_inv
 
             # 定位器父子关系
             for locator in bone.locators:
                 locator_obj = cast(Object, locator.blend_empty)
-                context.view_layer.update()
                 locator_obj.parent = bone_obj
-                locator_obj.matrix_parent_inverse = bone_obj.matrix_world.inverted()
+                locator_obj.matrix_parent_inverse = bone_inv
 
-        # 应用旋转
-        for bone in self.bones.values():
+        # 应用旋转（rotation_euler 的局部合成，不依赖世界矩阵）
+        for bone_idx, bone in enumerate(bones):
             bone_obj = cast(Object, bone.blend_empty)
-            context.view_layer.update()
-            self._mc_rotate(bone_obj, bone.rotation)
+            bone_obj.rotation_euler.rotate(
+                mathutils.Euler(tuple(bone_rots[bone_idx]), "XZY")
+            )
             for cube in bone.cubes:
                 cube_obj = cast(Object, cube.blend_cube)
                 self._mc_rotate(cube_obj, cube.rotation)
 
+        # 全部变换接好后只刷新一次依赖图
+        context.view_layer.update()
+
         return armature
 
     def _add_bone(
@@ -588,63 +726,49 @@ class ImportGeometry:
         """将 Minecraft 坐标 [X, Y, Z] 转换为 Blender 坐标 [X, Z, Y]"""
         return (vec[0], vec[2], vec[1])
 
-    def _mc_translate(
-        self, obj: Object, mc_translation: Vector3d, mc_size: Vector3d, mc_pivot: Vector3d
-    ):
-        """应用 Minecraft 坐标平移"""
-        assert isinstance(obj.data, Mesh)
-        # 转换坐标系并缩放
-        pivot = self._swap_yz(mc_pivot)
-        size = self._swap_yz(mc_size)
-        trans = self._swap_yz(mc_translation)
+    @staticmethod
+    def _cube_mesh_key(cube: ImportCube):
+        """网格去重键：顶点坐标和 UV 布局完全一致的方块可共享网格数据"""
+        uv_sig = tuple(
+            (face, tuple(data.get("uv", (0, 0))), tuple(data.get("uv_size", (0, 0))))
+            for face, data in sorted(cube.uv.items())
+        )
+        return (
+            tuple(np.round(cube.size, 5).tolist()),
+            round(float(cube.inflate), 5),
+            # 顶点里烘焙的是 origin - pivot 偏移，只有它一致才可共享
+            tuple(np.round(cube.origin - cube.pivot, 5).tolist()),
+            uv_sig,
+        )
 
-        pivot_offset = mathutils.Vector((
-            pivot[0] / MINECRAFT_SCALE_FACTOR,
-            pivot[1] / MINECRAFT_SCALE_FACTOR,
-            pivot[2] / MINECRAFT_SCALE_FACTOR,
-        ))
-        size_offset = mathutils.Vector((
-            size[0] / 2 / MINECRAFT_SCALE_FACTOR,
-            size[1] / 2 / MINECRAFT_SCALE_FACTOR,
-            size[2] / 2 / MINECRAFT_SCALE_FACTOR,
-        ))
-        translation = mathutils.Vector((
-            trans[0] / MINECRAFT_SCALE_FACTOR,
-            trans[1] / MINECRAFT_SCALE_FACTOR,
-            trans[2] / MINECRAFT_SCALE_FACTOR,
-        ))
-        for vertex in obj.data.vertices:
-            vertex.co += translation - pivot_offset + size_offset
-
-    def _mc_set_size(self, obj: Object, mc_size: Vector3d, inflate: float = 0.0):
-        """设置立方体大小"""
-        assert isinstance(obj.data, Mesh)
-        effective_inflate = inflate / MINECRAFT_SCALE_FACTOR
-
-        # 转换坐标系: [X, Y, Z] -> [X, Z, Y]
-        size = self._swap_yz(mc_size)
-        dx = size[0] / 2 / MINECRAFT_SCALE_FACTOR + effective_inflate
-        dy = size[1] / 2 / MINECRAFT_SCALE_FACTOR + effective_inflate
-        dz = size[2] / 2 / MINECRAFT_SCALE_FACTOR + effective_inflate
-
-        vertices = obj.data.vertices
-        # 0. ---; 1. --+; 2. -+-; 3. -++; 4. +--; 5. +-+; 6. ++-; 7. +++
-        vertices[0].co = mathutils.Vector((-dx, -dy, -dz))
-        vertices[1].co = mathutils.Vector((-dx, -dy, dz))
-        vertices[2].co = mathutils.Vector((-dx, dy, -dz))
-        vertices[3].co = mathutils.Vector((-dx, dy, dz))
-        vertices[4].co = mathutils.Vector((dx, -dy, -dz))
-        vertices[5].co = mathutils.Vector((dx, -dy, dz))
-        vertices[6].co = mathutils.Vector((dx, dy, -dz))
-        vertices[7].co = mathutils.Vector((dx, dy, dz))
+    def _emit_cube(self, cube_obj: Object, cube: ImportCube, write_mesh: bool = True):
+        """一步写出方块的最终顶点坐标与枢轴位置
+
+        尺寸、平移、枢轴原来是三次独立的顶点/位置遍历；变换是仿射的，
+        融合为一次 NumPy 计算加一次 foreach_set。
+        write_mesh 为 False 时网格数据来自共享缓存，只需设置枢轴位置。
+        """
+        assert isinstance(cube_obj.data, Mesh)
+        pivot = np.asarray(cube.pivot, dtype=np.float32)[_SWAP_YZ]
+        cube_obj.location = pivot * _INV_SCALE
+        if not write_mesh:
+            return
+
+        size = np.asarray(cube.size, dtype=np.float32)[_SWAP_YZ]
+        origin = np.asarray(cube.origin, dtype=np.float32)[_SWAP_YZ]
+
+        half = (size * 0.5 + cube.inflate) * _INV_SCALE
+        delta = (origin - pivot + size * 0.5) * _INV_SCALE
+        coords = _CUBE_SIGNS * half + delta
+        cube_obj.data.vertices.foreach_set("co", coords.ravel())
 
     def _mc_pivot(self, obj: Object, mc_pivot: Vector3d):
         """设置枢轴点"""
         pivot = self._swap_yz(mc_pivot)
         translation = mathutils.Vector((
-            pivot[0] / MINECRAFT_SCALE_FACTOR,
-            pivot[1] / MINECRAFT_SCALE_FACTOR,
-            pivot[2] / MINECRAFT_SCALE_FACTOR,
+            pivot[0] * _INV_SCALE,
+            pivot[1] * _INV_SCALE,
+            pivot[2] * _INV_SCALE,
         ))
         obj.location += translation
 
@@ -673,43 +797,34 @@ class ImportGeometry:
         if uv_layer is None:
             return
 
-        # 获取立方体的多边形面
-        # Blender 立方体面的顺序: 前(+Y), 后(-Y), 右(+X), 左(-X), 上(+Z), 下(-Z)
-        # Minecraft 面的顺序: north(-Y), south(+Y), east(+X), west(-X), up(+Z), down(-Z)
-        face_mapping = {
-            0: "south",  # +Y
-            1: "north",  # -Y
-            2: "east",   # +X
-            3: "west",   # -X
-            4: "up",     # +Z
-            5: "down",   # -Z
-        }
+        # 先收集全部角点，再批量转换并用一次 foreach_set 写入，
+        # 替代每个循环顶点一次的 RNA 写入和标量 convert 调用
+        buf = np.zeros((len(uv_layer.data), 2), dtype=np.float32)
+        uv_layer.data.foreach_get("uv", buf.ravel())
 
+        loop_rows: List[int] = []
+        corners_all: List[np.ndarray] = []
         for poly_idx, polygon in enumerate(mesh.polygons):
             if poly_idx >= 6:
                 break
 
-            face_name = face_mapping.get(poly_idx)
-            if face_name is None or face_name not in cube.uv:
+            face_uv = cube.uv.get(_FACE_MAPPING[poly_idx])
+            if face_uv is None:
                 continue
 
-            uv_data = cube.uv[face_name]
-            uv_pos = uv_data.get("uv", [0, 0])
-            uv_size = uv_data.get("uv_size", [0, 0])
+            uv_pos = np.asarray(face_uv.get("uv", (0, 0)), dtype=np.float64)
+            uv_size = np.asarray(face_uv.get("uv_size", (0, 0)), dtype=np.float64)
+            # 四个角的 UV 坐标: 左下, 右下, 右上, 左上
+            corners = uv_pos + uv_size * _CORNER_SIGNS
 
-            # 计算四个角的 UV 坐标
-            # 左下, 右下, 右上, 左上
-            corners = [
-                (uv_pos[0], uv_pos[1] + uv_size[1]),
-                (uv_pos[0] + uv_size[0], uv_pos[1] + uv_size[1]),
-                (uv_pos[0] + uv_size[0], uv_pos[1]),
-                (uv_pos[0], uv_pos[1]),
-            ]
-
-            # 应用 UV 到循环
             for i, loop_idx in enumerate(polygon.loop_indices):
                 if i < 4:
-                    uv_layer.data[loop_idx].uv = self.uv_converter.convert(corners[i])
+                    loop_rows.append(loop_idx)
+                    corners_all.append(corners[i])
+
+        if loop_rows:
+            buf[loop_rows] = self.uv_converter.convert_many(np.array(corners_all))
+            uv_layer.data.foreach_set("uv", buf.ravel())
 
 
 # ============================================================================
@@ -765,8 +880,7 @@ class IMPORT_OT_bedrock_model(bpy.types.Operator, ImportHelper):
 
     def execute(self, context):
         try:
-            with open(self.filepath, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = load_json_file(self.filepath)
 
             armature = import_bedrock_model(data, self.geometry_name, context)
             self.report({"INFO"}, f"成功导入模型: {armature.name}")
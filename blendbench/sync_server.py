@@ -0,0 +1,563 @@
+"""
+Blender 同步服务器
+通过 TCP 向外部客户端（如 Blockbench）广播场景变换，并响应简单的控制消息。
+协议为「4 字节大端长度前缀 + JSON 载荷」的帧。
+"""
+
+import asyncio
+import json
+import socket
+import struct
+from functools import lru_cache
+
+import bpy
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# 写缓冲超过该水位才 await drain，小帧快客户端的广播完全不让出
+_DRAIN_THRESHOLD = 64 * 1024
+
+# 写缓冲超过该上限视为客户端已不可救，直接断开止损
+_BUFFER_LIMIT = 1 << 20
+
+# 扇出超过该数量时按批写出，批间让出事件循环
+_BROADCAST_BATCH = 50
+
+# 每客户端发送队列的容量和单次 write 最多合并的帧数
+_QUEUE_SIZE = 64
+_COALESCE_MAX = 16
+
+# 广播在发送侧先攒一个短窗口，窗口内的帧合并成一次扇出
+_FLUSH_WINDOW = 0.005
+
+
+if orjson is not None:
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+elif msgspec is not None:
+    # msgspec 的 C 编解码器作次选；消息类型是开放集合
+    #（未知类型要原样转发），所以不用封闭的 tagged union Struct
+    _dumps = msgspec.json.Encoder().encode
+    _loads = msgspec.json.Decoder().decode
+else:
+    def _dumps(obj):
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+    _loads = json.loads
+
+
+def _frame(payload: bytes) -> bytes:
+    """为 JSON 载荷加上 4 字节大端长度前缀"""
+    return struct.pack(">I", len(payload)) + payload
+
+
+# 固定内容的帧在导入时编码好，响应路径上零序列化
+_PONG_FRAME = _frame(_dumps({"type": "pong"}))
+_WELCOME_FRAME = _frame(
+    _dumps({"type": "welcome", "message": "Connected to Blender Sync Server"})
+)
+
+
+class ServerState:
+    """服务器运行状态（供 UI 面板显示）"""
+
+    def __init__(self):
+        self.is_running = False
+        self.client_count = 0
+
+
+server_state = ServerState()
+
+# 活跃客户端 writer 列表；断开中的 writer 先打墓碑标记（_bb_dead），
+# 让正在进行的广播跳过它，实际移除在连接协程的收尾里完成
+_connected_clients = []
+_event_loop = None
+_server = None
+
+# 事件循环由 bpy.app.timers 在主线程上定时泵动，
+# 服务器协程与 bpy 数据访问同线程，不再需要后台线程和跨线程调度
+_PUMP_INTERVAL = 0.05
+
+# 装了 uvloop 就用 libuv 的循环，小帧高频写的开销明显更低
+if uvloop is not None:
+    _new_event_loop = uvloop.new_event_loop
+else:
+    _new_event_loop = asyncio.new_event_loop
+
+
+def _enqueue(writer, data):
+    """把一帧排入客户端的发送队列；队列满时丢最旧的帧
+
+    慢客户端的代价是丢帧，而不是堆积内存或拖慢别的客户端。
+    """
+    queue = writer._bb_queue
+    while True:
+        try:
+            queue.put_nowait(data)
+            return
+        except asyncio.QueueFull:
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+
+
+async def _maybe_drain(writer):
+    """写缓冲超过水位才真正 drain，常见的小帧快路径不让出事件循环"""
+    if writer.transport.get_write_buffer_size() > _DRAIN_THRESHOLD:
+        await writer.drain()
+
+
+async def _writer_loop(writer, queue):
+    """每个客户端一个发送协程：独占自己的 drain，互不阻塞"""
+    try:
+        while True:
+            data = await queue.get()
+            # 把已排队的帧并成一次 write，减少 transport 调用和 TCP 段
+            if not queue.empty():
+                parts = [data]
+                while not queue.empty() and len(parts) < _COALESCE_MAX:
+                    parts.append(queue.get_nowait())
+                data = b"".join(parts)
+            writer.write(data)
+            await _maybe_drain(writer)
+    except (ConnectionResetError, asyncio.CancelledError, OSError):
+        pass
+
+
+# 等待合并扇出的已编码帧
+_pending_out = []
+_flush_scheduled = False
+
+
+def _spawn_flush():
+    asyncio.ensure_future(_flush_pending())
+
+
+def _queue_broadcast(data):
+    """把已编码的帧攒进发送窗口，窗口到期后合并扇出"""
+    global _flush_scheduled
+    _pending_out.append(data)
+    if not _flush_scheduled and _event_loop is not None:
+        _flush_scheduled = True
+        _event_loop.call_later(_FLUSH_WINDOW, _spawn_flush)
+
+
+async def _flush_pending():
+    """把窗口内积累的帧合并成一个缓冲，一次性扇出给所有客户端"""
+    global _flush_scheduled
+    _flush_scheduled = False
+    if not _pending_out:
+        return
+    # 合并后只序列化出一个缓冲，同一个 memoryview 入所有队列；
+    # 传输层按引用缓冲，不做逐客户端拷贝
+    if len(_pending_out) == 1:
+        data = memoryview(_pending_out[0])
+    else:
+        data = memoryview(b"".join(_pending_out))
+    _pending_out.clear()
+
+    clients = _connected_clients
+    n = len(clients)
+    if n > _BROADCAST_BATCH:
+        # 大扇出先快照：批间让出时连接可能增删，不能迭代活列表
+        clients = list(clients)
+    for start in range(0, n, _BROADCAST_BATCH):
+        if start:
+            # 批间让出一轮事件循环，新连接和读协程不会被长广播饿死
+            await asyncio.sleep(0)
+        for writer in clients[start:start + _BROADCAST_BATCH]:
+            if getattr(writer, "_bb_dead", False):
+                continue
+            if writer.is_closing():
+                # 已在关闭的连接不再入队，等它的协程收尾移除
+                writer._bb_dead = True
+                continue
+            if writer.transport.get_write_buffer_size() > _BUFFER_LIMIT:
+                # 积压超过上限说明客户端早已停止消费，断开止损
+                writer._bb_dead = True
+                writer.close()
+                continue
+            _enqueue(writer, data)
+
+
+async def broadcast_message(message):
+    """向所有已连接客户端广播一条消息"""
+    if not _connected_clients:
+        return
+    _queue_broadcast(_frame(_dumps(message)))
+
+
+async def handle_client_message(writer, message):
+    """处理单条客户端消息"""
+    msg_type = message.get("type")
+    if msg_type == "ping":
+        _enqueue(writer, _PONG_FRAME)
+    elif msg_type == "echo":
+        response = {"type": "echo_reply", "data": message.get("data")}
+        _enqueue(writer, _frame(_dumps(response)))
+    else:
+        # 其余消息原样转发给所有客户端
+        await broadcast_message(message)
+
+
+async def client_handler(reader, writer):
+    """每个连接一个处理协程"""
+    addr = writer.get_extra_info("peername")
+    sock = writer.get_extra_info("socket")
+    if sock is not None:
+        # 关掉 Nagle：小帧不在内核里被攒批延迟，
+        # 用户态的合并窗口已经负责吞吐侧的批量
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    writer._bb_queue = asyncio.Queue(maxsize=_QUEUE_SIZE)
+    writer._bb_task = asyncio.ensure_future(
+        _writer_loop(writer, writer._bb_queue)
+    )
+    _connected_clients.append(writer)
+    server_state.client_count = len(_connected_clients)
+    print(f"同步客户端已连接: {addr}")
+
+    _enqueue(writer, _WELCOME_FRAME)
+
+    try:
+        while True:
+            # readexactly 整块读取帧，不做逐字节换行扫描，
+            # 载荷里也允许出现换行符
+            header = await reader.readexactly(4)
+            (length,) = struct.unpack(">I", header)
+            payload = await reader.readexactly(length)
+            try:
+                # orjson 直接接受 bytes，无需 decode/strip
+                message = _loads(payload)
+            except ValueError:
+                continue
+            await handle_client_message(writer, message)
+    except (
+        ConnectionResetError,
+        asyncio.IncompleteReadError,
+        asyncio.CancelledError,
+    ):
+        # CancelledError 来自 stop_server 的显式取消，吞掉它
+        # 让协程正常走完收尾，流回调里也不会再记录异常
+        pass
+    finally:
+        writer._bb_dead = True
+        writer._bb_task.cancel()
+        if writer in _connected_clients:
+            _connected_clients.remove(writer)
+        server_state.client_count = len(_connected_clients)
+        writer.close()
+        print(f"同步客户端已断开: {addr}")
+
+
+async def _start_listening(host, port):
+    global _server
+    _server = await asyncio.start_server(client_handler, host, port)
+
+
+def _pump_loop():
+    """定时泵动事件循环：执行当前就绪的回调后立即返回，不阻塞 UI"""
+    loop = _event_loop
+    if loop is None or loop.is_closed():
+        return None
+    loop.call_soon(loop.stop)
+    loop.run_forever()
+    return _PUMP_INTERVAL
+
+
+def start_server(host=DEFAULT_HOST, port=DEFAULT_PORT):
+    global _event_loop
+    if server_state.is_running:
+        return
+    loop = _new_event_loop()
+    _event_loop = loop
+    asyncio.set_event_loop(loop)
+    loop.run_until_complete(_start_listening(host, port))
+    bpy.app.timers.register(_pump_loop, first_interval=_PUMP_INTERVAL)
+    server_state.is_running = True
+
+
+def stop_server():
+    global _event_loop, _server, _flush_scheduled
+    if not server_state.is_running:
+        return
+    if bpy.app.timers.is_registered(_pump_loop):
+        bpy.app.timers.unregister(_pump_loop)
+    loop = _event_loop
+    if loop is not None:
+        if _server is not None:
+            _server.close()
+            loop.run_until_complete(_server.wait_closed())
+        # 显式取消所有连接协程和发送任务，并把循环跑到它们全部收尾；
+        # 只泵一轮不够——finally 清理还要再调度几次才会执行，
+        # 带着未完成任务 close 会报 “Task was destroyed but it is pending!”
+        pending = [task for task in asyncio.all_tasks(loop) if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            loop.run_until_complete(
+                asyncio.gather(*pending, return_exceptions=True)
+            )
+        loop.close()
+    _event_loop = None
+    _server = None
+    _connected_clients.clear()
+    _pending_out.clear()
+    _flush_scheduled = False
+    server_state.is_running = False
+    server_state.client_count = 0
+
+
+def send_message(message):
+    """向所有客户端广播（任务排入事件循环，由定时器泵执行）"""
+    loop = _event_loop
+    if loop is not None and server_state.is_running:
+        loop.create_task(broadcast_message(message))
+
+
+def send_payload(payload: bytes):
+    """广播已编码好的 JSON 载荷，跳过整体 dumps"""
+    if _event_loop is not None and server_state.is_running:
+        _queue_broadcast(_frame(payload))
+
+
+# ============================================================================
+# 场景变换监视
+# ============================================================================
+
+@lru_cache(maxsize=4096)
+def _encode_transform_entry(name, type_, loc, rot, scale):
+    """编码单个对象的 transform_update 条目；重复出现的姿态免编码"""
+    entry = {"type": type_, "location": loc, "rotation": rot, "scale": scale}
+    return _dumps(name) + b":" + _dumps(entry)
+
+class TransformWatch:
+    """监听依赖图更新，变换静止一段时间后把变化广播给客户端
+
+    变化由 depsgraph_update_post 推送，只处理真正变动的对象；
+    定时器只做去抖的尾沿发送，场景静止时不扫描任何对象。
+    """
+
+    PERIOD = 0.1
+    # 有待发送变更时加快到 50ms，缩短去抖尾沿的延迟
+    FAST_PERIOD = 0.05
+    # 连续空转约 2 秒后放慢到 500ms，静止场景少唤醒
+    IDLE_PERIOD = 0.5
+    IDLE_TICKS = 20
+    DEBOUNCE = 0.3
+
+    # 驻留表超过该大小时整体清空，防止长会话无限增长
+    INTERN_CAP = 4096
+
+    def __init__(self):
+        self.pending_transforms = {}
+        self.last_transforms = {}
+        self.idle_time = 0.0
+        self._idle_ticks = 0
+        self._registered = False
+        self._interned = {}
+
+    def start(self):
+        if not self._registered:
+            bpy.app.timers.register(
+                self._timer_callback, first_interval=self.PERIOD
+            )
+            handlers = bpy.app.handlers.depsgraph_update_post
+            if _on_depsgraph_update not in handlers:
+                handlers.append(_on_depsgraph_update)
+            self._registered = True
+
+    def stop(self):
+        if self._registered and bpy.app.timers.is_registered(self._timer_callback):
+            bpy.app.timers.unregister(self._timer_callback)
+        handlers = bpy.app.handlers.depsgraph_update_post
+        if _on_depsgraph_update in handlers:
+            handlers.remove(_on_depsgraph_update)
+        self._registered = False
+
+    def record_updates(self, depsgraph):
+        """从依赖图更新中收集变动对象的变换"""
+        if not server_state.is_running:
+            return
+        touched = False
+        for update in depsgraph.updates:
+            obj = update.id
+            if (
+                update.is_updated_transform
+                and isinstance(obj, bpy.types.Object)
+                and obj.type in {"MESH", "ARMATURE"}
+            ):
+                self.pending_transforms[obj.name] = self._snapshot_object(obj)
+                touched = True
+        if touched:
+            self.idle_time = 0.0
+            self._idle_ticks = 0
+
+    def _snapshot_object(self, obj):
+        loc = tuple(round(v, 5) for v in obj.location)
+        rot = tuple(round(v, 5) for v in obj.rotation_euler)
+        scale = tuple(round(v, 5) for v in obj.scale)
+        # 按打包后的数值驻留快照：对象回到出现过的姿态时复用同一个字典，
+        # 下游 diff 先做身份比较即可短路
+        key = obj.type.encode() + struct.pack("<9f", *loc, *rot, *scale)
+        cached = self._interned.get(key)
+        if cached is None:
+            if len(self._interned) >= self.INTERN_CAP:
+                self._interned.clear()
+            cached = {
+                "type": obj.type,
+                "location": loc,
+                "rotation": rot,
+                "scale": scale,
+            }
+            self._interned[key] = cached
+        return cached
+
+    def _timer_callback(self):
+        if not server_state.is_running:
+            return self.IDLE_PERIOD
+
+        if not self.pending_transforms:
+            # 空转越久唤醒越稀；一来变更就由处理器把计数清零
+            self._idle_ticks += 1
+            if self._idle_ticks > self.IDLE_TICKS:
+                return self.IDLE_PERIOD
+            return self.PERIOD
+
+        self._idle_ticks = 0
+        self.idle_time += self.FAST_PERIOD
+        # 变换稳定（去抖窗口内无新变化）后才发送
+        if self.idle_time >= self.DEBOUNCE:
+            self._send_changes()
+
+        return self.FAST_PERIOD
+
+    def _send_changes(self):
+        changed_objects = {}
+        for name, data in self.pending_transforms.items():
+            prev = self.last_transforms.get(name)
+            # 驻留保证未变化的条目就是同一个对象，身份比较先短路
+            if prev is not data and prev != data:
+                changed_objects[name] = data
+
+        if changed_objects:
+            # 外层帧由缓存的条目字节拼出来，整个消息不再整体 dumps
+            parts = [
+                _encode_transform_entry(
+                    name,
+                    data["type"],
+                    data["location"],
+                    data["rotation"],
+                    data["scale"],
+                )
+                for name, data in changed_objects.items()
+            ]
+            send_payload(
+                b'{"type":"transform_update","objects":{'
+                + b",".join(parts)
+                + b"}}"
+            )
+
+        self.last_transforms.update(self.pending_transforms)
+        self.pending_transforms.clear()
+        self.idle_time = 0.0
+
+
+@bpy.app.handlers.persistent
+def _on_depsgraph_update(scene, depsgraph):
+    transform_watch.record_updates(depsgraph)
+
+
+transform_watch = TransformWatch()
+
+
+# ============================================================================
+# 操作符和面板
+# ============================================================================
+
+class SYNC_OT_start_server(bpy.types.Operator):
+    """启动同步服务器"""
+
+    bl_idname = "blendbench.sync_start"
+    bl_label = "Start Sync Server"
+
+    def execute(self, context):
+        start_server()
+        transform_watch.start()
+        self.report({"INFO"}, f"同步服务器已启动: {DEFAULT_HOST}:{DEFAULT_PORT}")
+        return {"FINISHED"}
+
+
+class SYNC_OT_stop_server(bpy.types.Operator):
+    """停止同步服务器"""
+
+    bl_idname = "blendbench.sync_stop"
+    bl_label = "Stop Sync Server"
+
+    def execute(self, context):
+        transform_watch.stop()
+        stop_server()
+        self.report({"INFO"}, "同步服务器已停止")
+        return {"FINISHED"}
+
+
+class SYNC_PT_main_panel(bpy.types.Panel):
+    """同步服务器控制面板"""
+
+    bl_label = "Blendbench Sync"
+    bl_idname = "SYNC_PT_main_panel"
+    bl_space_type = "VIEW_3D"
+    bl_region_type = "UI"
+    bl_category = "Blendbench"
+
+    # 地址标签是常量；客户端数标签按值缓存，
+    # 视口重绘很频繁，状态没变时不重复格式化字符串
+    _RUNNING_LABEL = f"运行中: {DEFAULT_HOST}:{DEFAULT_PORT}"
+    _client_label_count = -1
+    _client_label = ""
+
+    def draw(self, context):
+        layout = self.layout
+        if server_state.is_running:
+            cls = SYNC_PT_main_panel
+            if server_state.client_count != cls._client_label_count:
+                cls._client_label_count = server_state.client_count
+                cls._client_label = f"客户端: {server_state.client_count}"
+            layout.label(text=self._RUNNING_LABEL, icon="CHECKMARK")
+            layout.label(text=cls._client_label, icon="USER")
+            layout.operator(SYNC_OT_stop_server.bl_idname, icon="PAUSE")
+        else:
+            layout.label(text="未运行", icon="X")
+            layout.operator(SYNC_OT_start_server.bl_idname, icon="PLAY")
+
+
+classes = (SYNC_OT_start_server, SYNC_OT_stop_server, SYNC_PT_main_panel)
+
+
+def register():
+    for cls in classes:
+        bpy.utils.register_class(cls)
+
+
+def unregister():
+    transform_watch.stop()
+    stop_server()
+    for cls in reversed(classes):
+        bpy.utils.unregister_class(cls)